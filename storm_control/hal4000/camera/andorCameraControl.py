@@ -190,6 +190,11 @@ class AndorCameraControl(cameraControl.HWCameraControl):
         self.newParameters(self.parameters, initialization = True)
 
     def closeShutter(self):
+        # If the shutter is already closed skip the camera stop /
+        # start bounce, a restart is usually the dominant latency in
+        # an interactive change.
+        if not self.camera_functionality.getShutterState():
+            return
         super().closeShutter()
         if self.camera_working:
             running = self.running
@@ -366,6 +371,9 @@ class AndorCameraControl(cameraControl.HWCameraControl):
             self.camera_functionality.parametersChanged.emit()
 
     def openShutter(self):
+        # If the shutter is already open don't bounce the camera.
+        if self.camera_functionality.getShutterState():
+            return
         super().openShutter()
         if self.camera_working:
             running = self.running
@@ -381,6 +389,10 @@ class AndorCameraControl(cameraControl.HWCameraControl):
                 self.startCamera()
 
     def setEMCCDGain(self, gain):
+        # If this is the gain the camera is already using don't
+        # bounce the camera.
+        if (gain == self.parameters.get("emccd_gain")):
+            return
         super().setEMCCDGain(gain)
         if self.camera_working:
             running = self.running
@@ -49,80 +49,99 @@ class Camera(halModule.HalModule):
                                       is_master = camera_params.get("master"))
 
         self.is_master = self.camera_control.getCameraFunctionality().isMaster()
-                                   
+
+        #
+        # Message dispatch table. A dictionary lookup is constant time
+        # per message, unlike an if / elif ladder of string compares,
+        # and adding a new message does not mean editing a ladder.
+        #
+        self.message_handlers = {"configuration" : self.handleMsgConfiguration,
+                                 "configure1" : self.handleMsgConfigure1,
+                                 "current parameters" : self.handleMsgCurrentParameters,
+                                 "get functionality" : self.handleMsgGetFunctionality,
+                                 "new parameters" : self.handleMsgNewParameters,
+                                 "shutter clicked" : self.handleMsgShutterClicked,
+                                 "start camera" : self.handleMsgStartCamera,
+                                 "start film" : self.handleMsgStartFilm,
+                                 "stop camera" : self.handleMsgStopCamera,
+                                 "stop film" : self.handleMsgStopFilm}
+
     def cleanUp(self, qt_settings):
         self.camera_control.cleanUp()
         super().cleanUp(qt_settings)
 
-    def processMessage(self, message):
+    def handleMsgConfiguration(self, message):
+        if message.sourceIs("timing"):
+            timing_fn = message.getData()["properties"]["functionality"]
+            is_time_base = (timing_fn.getTimeBase() == self.module_name)
+            halModule.runWorkerTask(self,
+                                    message,
+                                    lambda : self.startFilm(is_time_base))
+
+    def handleMsgConfigure1(self, message):
+        # Broadcast initial parameters.
+        self.sendMessage(halMessage.HalMessage(m_type = "initial parameters",
+                                               data = {"parameters" : self.camera_control.getParameters()}))
 
-        if message.isType("configuration"):
-            if message.sourceIs("timing"):
-                timing_fn = message.getData()["properties"]["functionality"]
-                is_time_base = (timing_fn.getTimeBase() == self.module_name)
-                halModule.runWorkerTask(self,
-                                        message, 
-                                        lambda : self.startFilm(is_time_base))
-
-        elif message.isType("configure1"):
-            # Broadcast initial parameters.
-            self.sendMessage(halMessage.HalMessage(m_type = "initial parameters",
-                                                   data = {"parameters" : self.camera_control.getParameters()}))
-
-            # Send 'configuration' message with information about this camera.
-            p_dict = {"module name" : self.module_name,
-                      "is camera" : True,
-                      "is master" : self.is_master}
-            self.sendMessage(halMessage.HalMessage(m_type = "configuration",
-                                                   data = {"properties" : p_dict}))
-
-        elif message.isType("current parameters"):
+        # Send 'configuration' message with information about this camera.
+        p_dict = {"module name" : self.module_name,
+                  "is camera" : True,
+                  "is master" : self.is_master}
+        self.sendMessage(halMessage.HalMessage(m_type = "configuration",
+                                               data = {"properties" : p_dict}))
+
+    def handleMsgCurrentParameters(self, message):
+        message.addResponse(halMessage.HalMessageResponse(source = self.module_name,
+                                                          data = {"parameters" : self.camera_control.getParameters().copy()}))
+
+    def handleMsgGetFunctionality(self, message):
+        # This message comes from display.cameraDisplay among others.
+        if (message.getData()["name"] == self.module_name):
             message.addResponse(halMessage.HalMessageResponse(source = self.module_name,
-                                                              data = {"parameters" : self.camera_control.getParameters().copy()}))
-            
-        elif message.isType("get functionality"):
-            # This message comes from display.cameraDisplay among others.
-            if (message.getData()["name"] == self.module_name):
-                message.addResponse(halMessage.HalMessageResponse(source = self.module_name,
-                                                                  data = {"functionality" : self.camera_control.getCameraFunctionality()}))
-
-        elif message.isType("new parameters"):
-            # This message comes from settings.settings
+                                                              data = {"functionality" : self.camera_control.getCameraFunctionality()}))
+
+    def handleMsgNewParameters(self, message):
+        # This message comes from settings.settings
+        halModule.runWorkerTask(self,
+                                message,
+                                lambda : self.updateParameters(message))
+
+    def handleMsgShutterClicked(self, message):
+        # This message comes from the shutter button.
+        if (message.getData()["camera"] == self.module_name):
             halModule.runWorkerTask(self,
                                     message,
-                                    lambda : self.updateParameters(message))
-
-        elif message.isType("shutter clicked"):
-            # This message comes from the shutter button.
-            if (message.getData()["camera"] == self.module_name):
-                halModule.runWorkerTask(self,
-                                        message,
-                                        self.toggleShutter)
-
-        elif message.isType("start camera"):
-            # This message comes from film.film. It is sent once for slaved
-            # cameras and once for master cameras.
-            if (message.getData()["master"] == self.is_master):
-                halModule.runWorkerTask(self, message, self.startCamera)
-
-        elif message.isType("start film"):
-            # This message comes from film.film, we save the film settings
-            # but don't actually do anything until we get a 'configuration'
-            # message from timing.timing.
-            self.film_settings = message.getData()["film settings"]
-
-        elif message.isType("stop camera"):
-            # This message comes from film.film. It is sent once for slaved
-            # cameras and once for master cameras.
-            if (message.getData()["master"] == self.is_master):
-                halModule.runWorkerTask(self, message, self.stopCamera)
-
-        elif message.isType("stop film"):
-            # This message comes from film.film, it goes to all camera at once.
-            self.film_length = None
-            message.addResponse(halMessage.HalMessageResponse(source = self.module_name,
-                                                              data = {"parameters" : self.camera_control.getParameters()}))
-            halModule.runWorkerTask(self, message, self.stopFilm)
+                                    self.toggleShutter)
+
+    def handleMsgStartCamera(self, message):
+        # This message comes from film.film. It is sent once for slaved
+        # cameras and once for master cameras.
+        if (message.getData()["master"] == self.is_master):
+            halModule.runWorkerTask(self, message, self.startCamera)
+
+    def handleMsgStartFilm(self, message):
+        # This message comes from film.film, we save the film settings
+        # but don't actually do anything until we get a 'configuration'
+        # message from timing.timing.
+        self.film_settings = message.getData()["film settings"]
+
+    def handleMsgStopCamera(self, message):
+        # This message comes from film.film. It is sent once for slaved
+        # cameras and once for master cameras.
+        if (message.getData()["master"] == self.is_master):
+            halModule.runWorkerTask(self, message, self.stopCamera)
+
+    def handleMsgStopFilm(self, message):
+        # This message comes from film.film, it goes to all camera at once.
+        self.film_length = None
+        message.addResponse(halMessage.HalMessageResponse(source = self.module_name,
+                                                          data = {"parameters" : self.camera_control.getParameters()}))
+        halModule.runWorkerTask(self, message, self.stopFilm)
+
+    def processMessage(self, message):
+        handler = self.message_handlers.get(message.getType())
+        if handler is not None:
+            handler(message)
 
     def startCamera(self):
         self.camera_control.startCamera()
@@ -10,6 +10,7 @@ Hazen 2/17
 """
 
 from PyQt5 import QtCore
+import sys
 import time
 
 import storm_control.sc_library.halExceptions as halExceptions
@@ -17,6 +18,18 @@ import storm_control.sc_library.parameters as params
 
 import storm_control.hal4000.camera.frame as frame
 
+#
+# These parameter name groups are needed on every parameter change,
+# so they are built once here instead of once per newParameters call.
+#
+x_limit_pnames = ("x_start", "x_end")
+y_limit_pnames = ("y_start", "y_end")
+
+# The parameters that are copied from the new parameters on every
+# parameter change, these are used for the display and for filming.
+copied_pnames = ["x_bin", "x_pixels", "x_start", "y_bin", "y_pixels", "y_start",
+                 "extension", "saved"]
+
 
 class CameraException(halExceptions.HardwareException):
     pass
@@ -46,6 +59,17 @@ class CameraControl(QtCore.QThread):
 
         # The length of a fixed length film.
         self.film_length = None
+
+        # The frame number at which to stop the camera during a fixed
+        # length film. This is sys.maxsize when the film is not length
+        # limited so that the acquisition loop only needs a single
+        # integer comparison per frame.
+        self.stop_at_frame = sys.maxsize
+
+        # Whether or not the camera has temperature control. This is
+        # fixed once the camera functionality exists, so it is checked
+        # once at the first camera start and remembered.
+        self.has_temperature = None
         
         # The current frame number, this gets reset by startCamera().
         self.frame_number = 0
@@ -213,7 +237,12 @@ class CameraControl(QtCore.QThread):
     def closeShutter(self):
         """
         Close the shutter.
+
+        The shutter signal is only emitted when the state actually
+        changes, so listeners are not woken up for nothing.
         """
+        if not self.camera_functionality.shutter_state:
+            return
         self.camera_functionality.shutter_state = False
         self.camera_functionality.shutter.emit(False)
 
@@ -243,14 +272,27 @@ class CameraControl(QtCore.QThread):
         Data from the camera should go through this method on it's
         way to the camera functionality object.
         """
-        for frame in frames:
-            if self.film_length is not None:
+        # Most of the time the camera gives us a single frame, handle
+        # this case with a straight-line path that skips the list
+        # filtering and iteration overhead below.
+        if (len(frames) == 1):
+            [frame] = frames
+            if (self.film_length is not None) and (frame.frame_number >= self.film_length):
+                return
+            self.camera_functionality.newFrame.emit(frame)
+            return
 
-                # This keeps us from emitting more than the expected number
-                # of newFrame signals.
-                if (frame.frame_number >= self.film_length):
-                    break
-                
+        #
+        # This keeps us from emitting more than the expected number of
+        # newFrame signals. The check is done once on the last frame of
+        # the burst so that we don't pay for a film length comparison
+        # on every frame.
+        #
+        if self.film_length is not None:
+            if (frames[-1].frame_number >= self.film_length):
+                frames = [x for x in frames if (x.frame_number < self.film_length)]
+
+        for frame in frames:
             self.camera_functionality.newFrame.emit(frame)
 
     def newParameters(self, parameters):
@@ -283,40 +325,50 @@ class CameraControl(QtCore.QThread):
         #        the parameters editor they won't even be shown.
         #
         max_x = self.parameters.get("x_chip") / parameters.get("x_bin")
-        for attr in ["x_start", "x_end"]:
+        for attr in x_limit_pnames:
             self.parameters.getp(attr).setMaximum(max_x)
 
         max_y = self.parameters.get("y_chip") / parameters.get("y_bin")
-        for attr in ["y_start", "y_end"]:
+        for attr in y_limit_pnames:
             self.parameters.getp(attr).setMaximum(max_y)
 
-        # Update parameters that are also used for the display.
-        for pname in ["x_bin", "x_pixels", "x_start", "y_bin", "y_pixels", "y_start"]:
-            self.parameters.setv(pname, parameters.get(pname))
-
-        # Update parameters that are used for filming.
-        self.parameters.setv("extension", parameters.get("extension"))
-        self.parameters.setv("saved", parameters.get("saved"))
+        # Update the parameters that are used for the display and for
+        # filming with a single multi-parameter setv() call.
+        self.parameters.setv(copied_pnames,
+                             [parameters.get(pname) for pname in copied_pnames])
 
     def openShutter(self):
         """
         Open the shutter.
+
+        As with closeShutter(), nothing is emitted if the shutter is
+        already open.
         """
+        if self.camera_functionality.shutter_state:
+            return
         self.camera_functionality.shutter_state = True
         self.camera_functionality.shutter.emit(True)
-        
+
     def setEMCCDGain(self, gain):
         """
-        Cameras that have EMCCD gain should override this. This method must 
+        Cameras that have EMCCD gain should override this. This method must
         also set the 'emccd_gain' parameter.
+
+        The emccdGain signal is only emitted when the gain actually
+        changes.
         """
+        if self.parameters.has("emccd_gain") and (gain == self.parameters.get("emccd_gain")):
+            return
         self.parameters.set("emccd_gain", gain)
         self.camera_functionality.emccdGain.emit(gain)
         
     def startCamera(self):
 
+        if self.has_temperature is None:
+            self.has_temperature = self.camera_functionality.hasTemperature()
+
         # Update the camera temperature, if available.
-        if self.camera_functionality.hasTemperature():
+        if self.has_temperature:
             self.getTemperature()
         
         self.frame_number = 0
@@ -344,6 +396,7 @@ class CameraControl(QtCore.QThread):
         """
         if film_settings.isFixedLength() and is_time_base:
             self.film_length = film_settings.getFilmLength()
+            self.stop_at_frame = self.film_length
 
     def stopCamera(self):
         if self.running:
@@ -354,6 +407,7 @@ class CameraControl(QtCore.QThread):
 
     def stopFilm(self):
         self.film_length = None
+        self.stop_at_frame = sys.maxsize
 
     def toggleShutter(self):
         if self.camera_functionality.getShutterState():
@@ -408,12 +462,15 @@ class HWCameraControl(CameraControl):
                     frame_data.append(aframe)
                     self.frame_number += 1
 
-                    if self.film_length is not None:                    
-                        if (self.frame_number == self.film_length):
-                            self.running = False
+                    if (self.frame_number == self.stop_at_frame):
+                        self.running = False
                             
-                # Emit new data signal.
-                self.newData.emit(frame_data)
+                #
+                # Emit new data signal. The frames are emitted as a
+                # tuple because every connected slot gets the same
+                # object, so no slot should be able to mutate it.
+                #
+                self.newData.emit(tuple(frame_data))
             self.msleep(5)
 
         self.camera.stopAcquisition()
@@ -118,6 +118,11 @@ class CameraFrameViewer(QtWidgets.QFrame):
         self.show_target = False
         self.stage_functionality = None
 
+        # Cached copy of the current feed's 'sync' parameter. Looking
+        # the parameter up involves a walk of the parameters tree,
+        # which is too expensive to repeat on every frame.
+        self.sync_value = 0
+
         #
         # Keep track of the default feed_name in the default parameters, these
         # are the parameters that will be used when we change parameter files
@@ -396,8 +401,8 @@ class CameraFrameViewer(QtWidgets.QFrame):
         self.camera_widget.setClickPos(*self.cam_fn.transformChipToFrame(cx, cy))
 
     def handleNewFrame(self, frame):
-        if self.filming and (self.getParameter("sync") != 0):
-            if((frame.frame_number % self.cycle_length) == (self.getParameter("sync") - 1)):
+        if self.filming and (self.sync_value != 0):
+            if((frame.frame_number % self.cycle_length) == (self.sync_value - 1)):
                 self.frame = frame
         else:
             self.frame = frame
@@ -424,7 +429,7 @@ class CameraFrameViewer(QtWidgets.QFrame):
         self.camera_view.getCurrentCenter()
 
     def handleSync(self, sync_value):
-        self.setParameter("sync", sync_value)
+        self.sync_value = self.setParameter("sync", sync_value)
 
     def handleTarget(self, boolean):
         if self.show_target:
@@ -557,7 +562,8 @@ class CameraFrameViewer(QtWidgets.QFrame):
         self.ui.rangeSlider.setValues([float(self.getParameter("display_min")),
                                        float(self.getParameter("display_max"))])
 
-        self.ui.syncSpinBox.setValue(self.getParameter("sync"))
+        self.sync_value = self.getParameter("sync")
+        self.ui.syncSpinBox.setValue(self.sync_value)
 
     def setFeedNames(self, feed_names):
         """
@@ -7,7 +7,9 @@ Hazen 03/17
 
 import copy
 import datetime
+import queue
 import struct
+import threading
 import tifffile
 import time
 
@@ -63,12 +65,22 @@ def createFileWriter(camera_functionality, film_settings):
 
 
 class BaseFileWriter(object):
-
+    """
+    Base class for the file writers.
+
+    The actual file I/O is done on a separate thread so that a slow
+    disk write does not stall the Qt event loop that is handling the
+    frames from the camera. Frames are handed to the writer thread
+    through a bounded queue. If the writer falls far enough behind
+    that the queue fills up then saveFrame() will block, which is no
+    worse than the old behavior of writing the frame in the slot.
+    """
     def __init__(self, camera_functionality = None, film_settings = None, **kwds):
         super().__init__(**kwds)
         self.cam_fn = camera_functionality
         self.film_settings = film_settings
         self.stopped = False
+        self.writer_exception = None
 
         # This is the frame size in MB.
         self.frame_size = self.cam_fn.getParameter("bytes_per_frame") *  0.000000953674
@@ -80,6 +92,12 @@ class BaseFileWriter(object):
             self.basename += "_" + self.cam_fn.getParameter("extension")
         self.filename = self.basename + self.film_settings.getFiletype()
 
+        # Start the thread that will write the frames to disk.
+        self.frame_queue = queue.Queue(maxsize = 100)
+        self.writer_thread = threading.Thread(target = self.handleWriteFrames,
+                                              daemon = True)
+        self.writer_thread.start()
+
         # Connect the camera functionality.
         self.cam_fn.newFrame.connect(self.saveFrame)
         self.cam_fn.stopped.connect(self.handleStopped)
@@ -89,17 +107,55 @@ class BaseFileWriter(object):
         self.cam_fn.newFrame.disconnect(self.saveFrame)
         self.cam_fn.stopped.disconnect(self.handleStopped)
 
+        # Wait for the writer thread to finish saving any queued frames.
+        self.frame_queue.put(None)
+        self.writer_thread.join()
+
+        # Surface a frame writing failure rather than completing what
+        # would be a silently truncated film.
+        if self.writer_exception is not None:
+            raise ImageWriterException("Film write failed: " + str(self.writer_exception))
+
     def getSize(self):
         return self.frame_size * self.number_frames
-    
+
     def handleStopped(self):
         self.stopped = True
 
+    def handleWriteFrames(self):
+        """
+        The writer thread, a None in the queue tells it to stop.
+
+        If writeFrame() throws, the exception is saved and re-raised
+        on the Qt side by saveFrame() / closeWriter(). The thread keeps
+        draining the queue so that neither of those methods can block
+        forever on a full queue that nothing is emptying.
+        """
+        while True:
+            frame = self.frame_queue.get()
+            if frame is None:
+                break
+            if self.writer_exception is None:
+                try:
+                    self.writeFrame(frame)
+                except Exception as e:
+                    self.writer_exception = e
+
     def isStopped(self):
         return self.stopped
-        
-    def saveFrame(self):
+
+    def saveFrame(self, frame):
+        if self.writer_exception is not None:
+            raise ImageWriterException("Film write failed: " + str(self.writer_exception))
         self.number_frames += 1
+        self.frame_queue.put(frame)
+
+    def writeFrame(self, frame):
+        """
+        Sub-classes should override this with the format specific I/O.
+        This is called on the writer thread, not the Qt thread.
+        """
+        pass
 
 
 class DaxFile(BaseFileWriter):
@@ -132,8 +188,7 @@ class DaxFile(BaseFileWriter):
                 inf_fp.write("y_end = " + h + "\n")
             inf_fp.close()
 
-    def saveFrame(self, frame):
-        super().saveFrame()
+    def writeFrame(self, frame):
         np_data = frame.getData()
         np_data.tofile(self.fp)
 
@@ -178,8 +233,7 @@ class SPEFile(BaseFileWriter):
         self.fp.seek(1446)
         self.fp.write(struct.pack("i", self.number_frames))
 
-    def saveFrame(self, frame):
-        super().saveFrame()
+    def writeFrame(self, frame):
         np_data = frame.getData()
         np_data.tofile(self.file_ptrs[index])
 
@@ -224,8 +278,7 @@ class TIFFile(BaseFileWriter):
         super().closeWriter()
         self.tif.close()
         
-    def saveFrame(self, frame):
-        super().saveFrame()
+    def writeFrame(self, frame):
         image = frame.getData()
         self.tif.save(image.reshape((frame.image_y, frame.image_x)),
                       metadata = self.metadata,
@@ -14,6 +14,10 @@ import storm_control.sc_hardware.andor.w1SpinningDisk as w1SpinningDisk
 import storm_control.sc_library.halExceptions as halExceptions
 import storm_control.sc_library.parameters as params
 
+# The allowed values of the disk pinhole size parameter.
+disk_50_micron = "50-micron pinholes"
+disk_25_micron = "25-micron pinholes"
+
 
 class W1Control(object):
     """
@@ -53,6 +57,26 @@ class W1Control(object):
         for pos, camera_dichroic in enumerate(camera_dichroic_names):
             self.camera_dichroic_config[camera_dichroic] = pos + 1
 
+        #
+        # Pre-build all of the W1 command strings so that newParameters
+        # does not have to format them on every parameter change.
+        #
+        self.dichroic_mirror_commands = {}
+        for dichroic_name, pos in self.dichroic_mirror_config.items():
+            self.dichroic_mirror_commands[dichroic_name] = "DMM_POS,1," + str(pos)
+
+        self.camera_dichroic_commands = {}
+        for camera_dichroic, pos in self.camera_dichroic_config.items():
+            self.camera_dichroic_commands[camera_dichroic] = "PT_POS,1," + str(pos)
+
+        self.filter_wheel_commands = {}
+        for name1, pos1 in self.filter_wheel_1_config.items():
+            for name2, pos2 in self.filter_wheel_2_config.items():
+                self.filter_wheel_commands[(name1, name2)] = "FW_POS,0," + str(pos1) + "," + str(pos2)
+
+        self.disk_speed_commands = tuple("MS," + str(i) for i in range(int(max_speed) + 1))
+        self.aperture_commands = tuple("AP_WIDTH,1," + str(i) for i in range(11))
+
         # Create parameters
         self.parameters = params.StormXMLObject()
 
@@ -67,8 +91,8 @@ class W1Control(object):
         # Disk properties
         self.parameters.add(params.ParameterSetString(description = "Disk pinhole size",
                                                       name = "disk",
-                                                      value = "50-micron pinholes",
-                                                      allowed = ["50-micron pinholes", "25-micron pinholes"]))
+                                                      value = disk_50_micron,
+                                                      allowed = [disk_50_micron, disk_25_micron]))
 
         self.parameters.add(params.ParameterRangeInt(description = "Disk speed (RPM)",
                                                      name = "disk_speed",
@@ -110,65 +134,78 @@ class W1Control(object):
                                                      min_value = 1,
                                                      max_value = 10))
 
+        # A simple dictionary of the current parameter values, used to
+        # figure out which parameters have changed.
+        self.current_values = {}
+
         self.newParameters(self.parameters, initialization = True)
 
     def getParameters(self):
         return self.parameters
-    
+
     def newParameters(self, parameters, initialization = False):
 
+        #
+        # All of the W1 parameters are immutable Python primitives so
+        # comparing against a dictionary snapshot of the values is a
+        # lot cheaper than walking the parameters tree with
+        # params.difference().
+        #
         if initialization:
             changed_p_names = parameters.getAttrs()
         else:
-            changed_p_names = params.difference(parameters, self.parameters)
+            changed_p_names = [pname for pname in parameters.getAttrs()
+                               if (parameters.get(pname) != self.current_values.get(pname))]
 
         p = parameters
+        w1_commands = []
         for pname in changed_p_names:
 
             # Update our current parameters.
             self.parameters.setv(pname, p.get(pname))
+            self.current_values[pname] = p.get(pname)
 
             # Configure the W1.
             if (pname == "bright_field_bypass"):
                 if p.get("bright_field_bypass"):
-                    self.w1.commandResponse("BF_ON", 1)
+                    w1_commands.append(["BF_ON", 1])
                 else:
-                    self.w1.commandResponse("BF_OFF", 1)
+                    w1_commands.append(["BF_OFF", 1])
 
             elif (pname == "spin_disk"):
                 if p.get("spin_disk"):
-                    self.w1.commandResponse("MS_RUN", 3)
+                    w1_commands.append(["MS_RUN", 3])
                 else:
-                    self.w1.commandResponse("MS_STOP", 1)
-                    
+                    w1_commands.append(["MS_STOP", 1])
+
             elif (pname == "disk"):
-                if (p.get("disk") == "50-micron pinholes"):
-                    self.w1.commandResponse("DC_SLCT,1", 3)
-                elif (p.get("disk") == "25-micron pinholes"):
-                    self.w1.commandResponse("DC_SLCT,2", 3)
+                if (p.get("disk") == disk_50_micron):
+                    w1_commands.append(["DC_SLCT,1", 3])
+                elif (p.get("disk") == disk_25_micron):
+                    w1_commands.append(["DC_SLCT,2", 3])
 
             elif (pname == "disk_speed"):
-                self.w1.commandResponse("MS,"+str(p.get("disk_speed")), 1)
+                w1_commands.append([self.disk_speed_commands[p.get("disk_speed")], 1])
 
             elif (pname == "dichroic_mirror"):
-                dichroic_num = self.dichroic_mirror_config[p.get("dichroic_mirror")]
-                self.w1.commandResponse("DMM_POS,1,"+str(dichroic_num), 1)
+                w1_commands.append([self.dichroic_mirror_commands[p.get("dichroic_mirror")], 1])
 
             elif (pname == "filter_wheel_pos1") or (pname == "filter_wheel_pos2"):
-                filter1_num = self.filter_wheel_1_config[p.get("filter_wheel_pos1")]
-                filter2_num = self.filter_wheel_2_config[p.get("filter_wheel_pos2")]
-                self.w1.commandResponse("FW_POS,0," + str(filter1_num) + "," + str(filter2_num), 0.1)
+                filter_wheel_pos = (p.get("filter_wheel_pos1"), p.get("filter_wheel_pos2"))
+                w1_commands.append([self.filter_wheel_commands[filter_wheel_pos], 0.1])
 
             elif (pname == "camera_dichroic_mirror"):
-                camera_dichroic_num = self.camera_dichroic_config[p.get("camera_dichroic_mirror")]
-                self.w1.commandResponse("PT_POS,1," + str(camera_dichroic_num), 1)
+                w1_commands.append([self.camera_dichroic_commands[p.get("camera_dichroic_mirror")], 1])
 
             elif (pname == "aperture"):
-                self.w1.commandResponse("AP_WIDTH,1,"+str(p.get("aperture")), 0.5)
+                w1_commands.append([self.aperture_commands[p.get("aperture")], 0.5])
 
             else:
                 print(">> Warning", str(pname), " is not a valid parameter for the W1")
 
+        # Send all of the changes in a single serial transaction.
+        self.w1.batchCommandResponse(w1_commands)
+
 
 class W1SpinDiskModule(hardwareModule.HardwareModule):
 
@@ -6,8 +6,22 @@ Jeffrey Moffitt 5/16
 Hazen Babcock 5/17
 """
 
+import logging
+import time
+
+import storm_control.sc_hardware.andor.w1_parse_c as w1Parse
 import storm_control.sc_hardware.serial.RS232 as RS232
 
+#
+# Used for debugging the serial transactions. When the level is above
+# DEBUG each logging call costs one integer comparison and no string
+# formatting, the arguments are only formatted if the record is kept.
+#
+w1_logger = logging.getLogger(__name__)
+
+# The W1 negative acknowledgement code.
+w1_nak = "N"
+
 
 class W1SpinningDisk(RS232.RS232):
 
@@ -38,37 +52,125 @@ class W1SpinningDisk(RS232.RS232):
                             "30302": "Shutter unopenable error",
                             "1": "Unknown serial communication error"}
 
+        # Reusable receive buffer for batchCommandResponse, so that
+        # draining a batch extends one bytearray in place instead of
+        # allocating a new string for every read.
+        self.read_buffer = bytearray()
+
+    def batchCommandResponse(self, commands):
+        """
+        Send several commands in a single write, then read one response
+        per command. This way we only pay the serial round-trip latency
+        once instead of once per command.
+
+        commands - A list of [command, timeout] lists.
+
+        Returns a list with one parsed response per command.
+        """
+        if (len(commands) == 0):
+            return []
+
+        # Clear buffer of old responses.
+        self.tty.timeout = 0
+        while (len(self.readline()) > 0):
+            pass
+
+        # Send all of the commands in a single write.
+        w1_logger.debug("Writing: %s", commands)
+        self.write("".join([elt[0] + self.end_of_line for elt in commands]))
+
+        #
+        # Poll for the responses instead of calling readline() with a
+        # blocking timeout for each one. The time budget is the sum of
+        # the individual command timeouts but it covers the batch as a
+        # whole, so we return as soon as the last response arrives.
+        #
+        n_expected = len(commands)
+        end_time = time.time() + sum([elt[1] for elt in commands])
+
+        eol = self.end_of_line.encode(self.encoding)
+        buf = self.read_buffer
+        del buf[:]
+        n_seen = 0
+        while (n_seen < n_expected) and (time.time() < end_time):
+            n_waiting = self.tty.inWaiting()
+            if (n_waiting > 0):
+                data = self.tty.read(n_waiting)
+                buf += data
+                n_seen += data.count(eol)
+            else:
+                time.sleep(self.wait_time)
+
+        # Parse the response to each command, using the C parser if
+        # it is available.
+        responses = []
+        parsed = w1Parse.parseResponses(buf, n_expected,
+                                        use_python = not w1Parse.haveCLibrary())
+        for [value, status] in parsed:
+            if (status == w1Parse.OK):
+                responses.append(value.decode(self.encoding))
+            elif (status == w1Parse.NAK):
+                value = value.decode(self.encoding)
+                error = self.error_codes.get(value)
+                if error is not None:
+                    w1_logger.warning("w1 error %s", error)
+                else:
+                    w1_logger.warning("unknown w1 error %s", value)
+                responses.append(None)
+            else:
+                responses.append(None)
+
+        # Pad with None for any missing responses.
+        while (len(responses) < n_expected):
+            responses.append(None)
+        return responses
+
     def commandResponse(self, command, timeout = 0.1):
 
         # Clear buffer of old responses.
         self.tty.timeout = 0
         while (len(self.readline()) > 0):
             pass
-        
+
         # Set timeout.
         self.tty.timeout = timeout
 
         # Send the command and wait timeout time for a response.
+        w1_logger.debug("Writing: %s", command)
         self.writeline(command)
-        response = self.readline()
+        return self.parseResponse(self.readline())
 
+    def parseResponse(self, response):
+        """
+        Parse a single 'value:code' response from the W1. Returns the
+        value, or None if there was no response or the W1 reported an
+        error.
+        """
         # Check that we got a message within the timeout.
-        if (len(response) > 0):
-            [value, code] = response.split(":")[:2]
-
-            # Did we get an error?
-            if (code == "N\r"):
-                try:
-                    print(">> Warning w1 error", self.error_codes[value])
-                except KeyError:
-                    print(">> Warning unknown w1 error", value)                    
-                return None            
-            else:
-                return value
+        w1_logger.debug("Response: %s", response)
+        if (len(response) == 0):
+            return None
 
-        else:
+        #
+        # rpartition() never throws so we don't need any exception
+        # handling on this path. Note that readline() has already
+        # stripped the end of line characters off the response.
+        #
+        [value, sep, code] = response.rpartition(":")
+        if (len(sep) == 0):
             return None
 
+        # Did we get an error?
+        if (code == w1_nak):
+            error = self.error_codes.get(value)
+            if error is not None:
+                w1_logger.warning("w1 error %s", error)
+            else:
+                w1_logger.warning("unknown w1 error %s", value)
+            return None
+        else:
+            return value
+
 
 #
 # The MIT License
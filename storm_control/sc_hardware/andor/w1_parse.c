@@ -0,0 +1,118 @@
+/*
+ * @file
+ *
+ * Parsing of batched W1 spinning disk responses. The responses look
+ * like 'value:code' and are separated by '\r'. This is written in C
+ * so that draining a batch does not run the Python interpreter for
+ * every character of every response.
+ *
+ * Compilation (windows):
+ * gcc -c w1_parse.c -O3
+ * gcc -shared -o w1_parse.dll w1_parse.o
+ *
+ * Compilation (linux):
+ * gcc -fPIC -g -c -Wall w1_parse.c -O3
+ * gcc -shared -Wl,-soname,w1_parse.so.1 -o w1_parse.so.1.0.1 w1_parse.o -lc
+ * ln -s w1_parse.so.1.0.1 w1_parse.so
+ *
+ */
+
+/* Response status values, these must match w1_parse_c.py. */
+#define W1_OK 0
+#define W1_NAK 1
+#define W1_MALFORMED 2
+
+/* function definitions */
+int parseResponses(char *, int, int *, int *, int *, int);
+
+/* parseResponses
+ *
+ * Splits a buffer of responses on '\r' and locates the value and the
+ * acknowledgement code of each response. The value of response i is
+ * the 'lengths[i]' bytes starting at 'offsets[i]' in the buffer.
+ *
+ * @param buffer The raw response bytes.
+ * @param size The number of bytes in buffer.
+ * @param offsets Pre-allocated storage for the value offsets.
+ * @param lengths Pre-allocated storage for the value lengths.
+ * @param status Pre-allocated storage for the response status values.
+ * @param max_responses The size of the offsets / lengths / status arrays.
+ *
+ * @return The number of responses that were found.
+ */
+int parseResponses(char *buffer, int size, int *offsets, int *lengths, int *status, int max_responses)
+{
+  int colon,end,i,n,start;
+
+  n = 0;
+  start = 0;
+  while((start < size) && (n < max_responses)){
+
+    /* Skip any leading end of line characters. */
+    while((start < size) && ((buffer[start] == '\r') || (buffer[start] == '\n'))){
+      start++;
+    }
+    if (start >= size){
+      break;
+    }
+
+    /* Find the end of the response. */
+    end = start;
+    while((end < size) && (buffer[end] != '\r')){
+      end++;
+    }
+
+    /* Find the last colon in the response. */
+    colon = -1;
+    for(i=end-1;i>=start;i--){
+      if (buffer[i] == ':'){
+        colon = i;
+        break;
+      }
+    }
+
+    if (colon < 0){
+      offsets[n] = start;
+      lengths[n] = end - start;
+      status[n] = W1_MALFORMED;
+    }
+    else{
+      offsets[n] = start;
+      lengths[n] = colon - start;
+      if (((end - colon) == 2) && (buffer[colon+1] == 'N')){
+        status[n] = W1_NAK;
+      }
+      else{
+        status[n] = W1_OK;
+      }
+    }
+    n++;
+    start = end + 1;
+  }
+
+  return n;
+}
+
+/*
+ * The MIT License
+ *
+ * Copyright (c) 2017 Zhuang Lab, Harvard University
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining a copy
+ * of this software and associated documentation files (the "Software"), to deal
+ * in the Software without restriction, including without limitation the rights
+ * to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ * copies of the Software, and to permit persons to whom the Software is
+ * furnished to do so, subject to the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be included in
+ * all copies or substantial portions of the Software.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ * THE SOFTWARE.
+ */
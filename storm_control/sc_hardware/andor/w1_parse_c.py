@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+"""
+Python interface to the C W1 response parsing library. This is used
+to speed up draining the responses to a batch of W1 commands, which
+in Python is dominated by interpreter dispatch.
+
+A pure Python implementation of the same parsing is included both as
+a fallback for when the library is not available and for testing that
+the two implementations agree.
+"""
+
+import ctypes
+
+import storm_control.c_libraries.loadclib as loadclib
+
+# Response status values, these must match w1_parse.c.
+OK = 0
+NAK = 1
+MALFORMED = 2
+
+try:
+    w1_parse = loadclib.loadCLibrary("w1_parse")
+
+    # C interface definition.
+    w1_parse.parseResponses.argtypes = [ctypes.c_char_p,
+                                        ctypes.c_int,
+                                        ctypes.POINTER(ctypes.c_int),
+                                        ctypes.POINTER(ctypes.c_int),
+                                        ctypes.POINTER(ctypes.c_int),
+                                        ctypes.c_int]
+    w1_parse.parseResponses.restype = ctypes.c_int
+
+except OSError:
+    w1_parse = None
+
+
+def haveCLibrary():
+    """
+    Return True/False if the C library was found.
+    """
+    return w1_parse is not None
+
+
+def parseResponses(buffer, max_responses, use_python = False):
+    """
+    Split a buffer of W1 responses into a list of [value, status]
+    lists, where value is a bytes object and status is one of OK,
+    NAK or MALFORMED.
+
+    buffer - The raw response bytes.
+    max_responses - The maximum number of responses to parse.
+    use_python - Parse in Python instead of C, mostly for testing.
+    """
+    buffer = bytes(buffer)
+
+    if use_python:
+        responses = []
+        for response in buffer.split(b"\r"):
+            if (len(responses) == max_responses):
+                break
+            response = response.lstrip(b"\n")
+            if (len(response) == 0):
+                continue
+            [value, sep, code] = response.rpartition(b":")
+            if (len(sep) == 0):
+                responses.append([response, MALFORMED])
+            elif (code == b"N"):
+                responses.append([value, NAK])
+            else:
+                responses.append([value, OK])
+        return responses
+
+    offsets = (ctypes.c_int * max_responses)()
+    lengths = (ctypes.c_int * max_responses)()
+    status = (ctypes.c_int * max_responses)()
+    n_found = w1_parse.parseResponses(buffer,
+                                      len(buffer),
+                                      offsets,
+                                      lengths,
+                                      status,
+                                      max_responses)
+    responses = []
+    for i in range(n_found):
+        responses.append([buffer[offsets[i]:offsets[i] + lengths[i]], status[i]])
+    return responses
+
+
+#
+# The MIT License
+#
+# Copyright (c) 2017 Zhuang Lab, Harvard University
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
@@ -8,12 +8,20 @@ Hazen 01/14
 import functools
 import logging
 import logging.handlers
+import os
 
 from PyQt5 import QtCore
 
 a_logger = False
 logging_mutex = QtCore.QMutex()
 
+#
+# Function call tracing adds overhead to every decorated call, even
+# when logging is off, so it is disabled by default. Set the
+# HAL_HDEBUG environment variable to "1" to turn it back on.
+#
+want_traces = (os.environ.get("HAL_HDEBUG", "0") == "1")
+
 def objectToString(a_object, a_name, a_attrs):
     a_string = "<" + a_name
     for a_attr in a_attrs:
@@ -28,8 +36,14 @@ def debug(fn):
     """
     Function decorator. This logs all the arguments to a function that it decorates
     if logging has been started.
+
+    If tracing was not requested the function is returned undecorated,
+    some of the decorated methods are called frequently enough that
+    even the disabled wrapper is measurable.
     """
     global a_logger, logging_mutex
+    if not want_traces:
+        return fn
     @functools.wraps(fn)
     def __wrapper(*args, **kw):
         if a_logger:
@@ -64,6 +64,40 @@ def testFocusQuality():
     assert(grad == 0.0)
     
 
+def testW1Parse():
+    import storm_control.sc_hardware.andor.w1_parse_c as w1Parse
+
+    assert(w1Parse.haveCLibrary())
+
+    # The C and the Python parsers should agree on all of these.
+    buffers = [b"4000:A\r",                           # A normal response.
+               b"30005:N\r",                          # A NAK response.
+               b"garbage\r",                          # A malformed response.
+               b":N\r",                               # A NAK with an empty value.
+               b"value:NO\r",                         # A code that is not exactly 'N'.
+               b"",                                   # No response at all.
+               b"\r\r\r",                             # Empty responses.
+               b"4000:A\r123",                        # Missing the trailing end of line.
+               b"4000:A\r30005:N\rgarbage\rX:A\r"]    # A batch.
+
+    for buffer in buffers:
+        c_resp = w1Parse.parseResponses(buffer, 10)
+        py_resp = w1Parse.parseResponses(buffer, 10, use_python = True)
+        assert(c_resp == py_resp)
+
+    # Check parsing against the expected values.
+    expected = [[b"4000", w1Parse.OK],
+                [b"30005", w1Parse.NAK],
+                [b"garbage", w1Parse.MALFORMED]]
+    assert(w1Parse.parseResponses(b"4000:A\r30005:N\rgarbage\r", 10) == expected)
+
+    # Check that max_responses is respected.
+    for use_python in [False, True]:
+        responses = w1Parse.parseResponses(b"1:A\r2:A\r3:A\r", 2,
+                                           use_python = use_python)
+        assert(len(responses) == 2)
+
+
 def testLMMoment():
     import storm_control.hal4000.camera.frame as frame
     import storm_control.hal4000.spotCounter.lmmObjectFinder as lof
@@ -90,5 +124,6 @@ if (__name__ == "__main__"):
     testCImageManipulation()
     testFocusQuality()
     testLMMoment()
+    testW1Parse()
     
     